@@ -1,31 +1,67 @@
-import sys
-from src.parser import Parser
-from src.semantic import SemanticAnalyzer
-
-
-def main():
-    if len(sys.argv) < 2:
-        print('Usage: python run.py <source.cpp>')
-        sys.exit(1)
-    path = sys.argv[1]
-    code = open(path, 'r', encoding='utf8').read()
-    parser = Parser(code)
-    try:
-        prog = parser.parse()
-    except Exception as e:
-        print('Parse error:', e)
-        sys.exit(1)
-    print('Parsed AST:')
-    print(prog)
-    sem = SemanticAnalyzer(prog)
-    sem.analyze()
-    if sem.errors:
-        print('\nSemantic errors:')
-        for e in sem.errors:
-            print('-', e)
-    else:
-        print('\nNo semantic errors detected.')
-
-
-if __name__ == '__main__':
-    main()
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+from src.parser import Parser
+from src.semantic import SemanticAnalyzer
+
+# Parsing is deterministic, so ASTs are cached on disk keyed by a hash of
+# the source; re-running over unchanged files skips the parse entirely.
+# The key is salted with a digest of every source the parse output depends
+# on — lexer (keywords, token spec), parser, node layout, and the generated
+# pattern tab when present — so a change to any of them invalidates old
+# entries instead of serving a stale tree.
+CACHE_DIR = Path('.ast_cache')
+
+_SRC_DIR = Path(__file__).resolve().parent / 'src'
+_SCHEMA = hashlib.sha1(b''.join(
+    (_SRC_DIR / name).read_bytes()
+    for name in ('lexer.py', '_lextab.py', 'parser.py', 'ast.py')
+    if (_SRC_DIR / name).exists()
+)).hexdigest()[:12]
+
+
+def parse_cached(code):
+    key = hashlib.sha1(code.encode()).hexdigest()
+    cache = CACHE_DIR / f'{key}-{_SCHEMA}'
+    if cache.exists():
+        try:
+            return pickle.loads(cache.read_bytes())
+        except Exception:
+            pass  # corrupt or incompatible entry: fall through and reparse
+    prog = Parser(code).parse()
+    # the cache is best-effort: an unwritable directory must not turn a
+    # successful parse into a reported parse failure
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        cache.write_bytes(pickle.dumps(prog))
+    except OSError:
+        pass
+    return prog
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python run.py <source.cpp>')
+        sys.exit(1)
+    path = sys.argv[1]
+    code = open(path, 'r', encoding='utf8').read()
+    try:
+        prog = parse_cached(code)
+    except Exception as e:
+        print('Parse error:', e)
+        sys.exit(1)
+    print('Parsed AST:')
+    print(prog)
+    sem = SemanticAnalyzer(prog)
+    sem.analyze()
+    if sem.errors:
+        print('\nSemantic errors:')
+        for e in sem.errors:
+            print('-', e)
+    else:
+        print('\nNo semantic errors detected.')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,33 @@
-import subprocess
-import sys
-import os
-
-HERE = os.path.dirname(__file__)
-EXAMPLES = os.path.join(HERE, 'examples')
-
-def run_one(path):
-    print('--- Running', os.path.basename(path))
-    proc = subprocess.run([sys.executable, os.path.join(HERE, 'run.py'), path], capture_output=True, text=True)
-    print(proc.stdout)
-    if proc.stderr:
-        print('STDERR:')
-        print(proc.stderr)
-    print('Exit code:', proc.returncode)
-    print()
-
-def main():
-    files = [f for f in os.listdir(EXAMPLES) if f.endswith('.cpp')]
-    files.sort()
-    for f in files:
-        run_one(os.path.join(EXAMPLES, f))
-
-if __name__ == '__main__':
-    main()
+import sys
+import os
+
+import run
+
+HERE = os.path.dirname(__file__)
+EXAMPLES = os.path.join(HERE, 'examples')
+
+def run_one(path):
+    # call run.main in-process instead of spawning an interpreter per file,
+    # so module imports and the compiled lexer regex are paid once
+    print('--- Running', os.path.basename(path))
+    argv = sys.argv
+    sys.argv = [os.path.join(HERE, 'run.py'), path]
+    code = 0
+    try:
+        run.main()
+    except SystemExit as e:
+        code = e.code or 0
+    finally:
+        sys.argv = argv
+    print()
+    print('Exit code:', code)
+    print()
+
+def main():
+    files = [f for f in os.listdir(EXAMPLES) if f.endswith('.cpp')]
+    files.sort()
+    for f in files:
+        run_one(os.path.join(EXAMPLES, f))
+
+if __name__ == '__main__':
+    main()
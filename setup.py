@@ -0,0 +1,53 @@
+"""Optional build script that compiles the hot modules to C extensions.
+
+Two backends are supported, both keeping the plain .py sources as the
+import fallback so an environment without a compiler still works:
+
+- Cython (default): compiles the lexer and parser .py files directly.
+- mypyc (set MINICPP_USE_MYPYC=1): compiles lexer, parser, semantic and
+  ast from their type annotations; no per-module directives needed, and
+  its class specialization suits the dataclass-heavy semantic pass.
+
+Build with:
+
+    python setup.py build_ext --inplace
+"""
+import os
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get('MINICPP_USE_MYPYC'):
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        mypycify = None
+    if mypycify is not None:
+        ext_modules = mypycify([
+            'src/lexer.py',
+            'src/parser.py',
+            'src/semantic.py',
+            'src/ast.py',
+        ])
+else:
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        cythonize = None
+    if cythonize is not None:
+        ext_modules = cythonize(
+            ['src/lexer.py', 'src/parser.py'],
+            compiler_directives={
+                'language_level': 3,
+                'boundscheck': False,
+                'wraparound': False,
+            },
+        )
+
+setup(
+    name='mini-cpp-compiler',
+    version='0.1',
+    packages=['src'],
+    # dataclass(slots=True) in src/ast.py needs 3.10+
+    python_requires='>=3.10',
+    ext_modules=ext_modules,
+)
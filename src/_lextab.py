@@ -0,0 +1,3 @@
+# Generated by `python -m src.lexer --generate-tab`. Do not edit;
+# regenerate after changing Lexer.token_specification.
+PATTERN_SRC = "(?P<COMMENT>//.*)|(?P<MULTICOMMENT>/\\*[\\s\\S]*?\\*/)|(?P<CHAR>'(?:\\\\.|[^\\\\'])')|(?P<FLOAT>\\d+\\.\\d+)|(?P<INT>\\d+)|(?P<ID>[A-Za-z_][A-Za-z0-9_]*)|(?P<OP>==|!=|<=|>=|\\|\\||&&|\\+\\+|--|\\+=|-=|\\*=|/=|%=|[+\\-*/%<>=!&|.,;:(){}\\[\\]])|(?P<SKIP>\\s+)"
@@ -1,93 +1,109 @@
-from dataclasses import dataclass
-from typing import List, Optional, Any
-
-
-class Node:
-    pass
-
-
-@dataclass
-class Program(Node):
-    declarations: List[Node]
-
-
-@dataclass
-class FuncDecl(Node):
-    ret_type: str
-    name: str
-    params: List[Any]
-    body: Any
-
-
-@dataclass
-class VarDecl(Node):
-    var_type: str
-    name: str
-    init: Optional[Any] = None
-    is_const: bool = False
-
-
-@dataclass
-class Compound(Node):
-    statements: List[Node]
-
-
-@dataclass
-class If(Node):
-    cond: Any
-    then_branch: Any
-    else_branch: Optional[Any]
-
-
-@dataclass
-class While(Node):
-    cond: Any
-    body: Any
-
-
-@dataclass
-class For(Node):
-    init: Optional[Any]
-    cond: Optional[Any]
-    post: Optional[Any]
-    body: Any
-
-
-@dataclass
-class Return(Node):
-    expr: Optional[Any]
-
-
-@dataclass
-class ExprStmt(Node):
-    expr: Any
-
-
-@dataclass
-class BinaryOp(Node):
-    op: str
-    left: Any
-    right: Any
-
-
-@dataclass
-class UnaryOp(Node):
-    op: str
-    expr: Any
-
-
-@dataclass
-class Literal(Node):
-    value: Any
-    typ: str
-
-
-@dataclass
-class VarRef(Node):
-    name: str
-
-
-@dataclass
-class FuncCall(Node):
-    name: str
-    args: List[Any]
+from dataclasses import dataclass, field
+from typing import Any, Dict, Final, List, Optional
+
+
+class Node:
+    pass
+
+
+class Ty:
+    # Integer codes for the builtin types: comparing small ints is much
+    # cheaper than string equality in the semantic pass. Convert back to
+    # the textual name (via _name) only when formatting error messages.
+    INT: Final = 1
+    FLOAT: Final = 2
+    CHAR: Final = 3
+    BOOL: Final = 4
+    VOID: Final = 5
+    _byname: Final[Dict[str, int]] = {'int': INT, 'float': FLOAT, 'char': CHAR, 'bool': BOOL, 'void': VOID}
+    _name: Final[Dict[int, str]] = {v: k for k, v in _byname.items()}
+
+
+@dataclass(slots=True)
+class Program(Node):
+    declarations: List[Node]
+
+
+@dataclass(slots=True)
+class FuncDecl(Node):
+    ret_type: int
+    name: str
+    params: List[Any]
+    body: Any
+
+
+@dataclass(slots=True)
+class VarDecl(Node):
+    var_type: int
+    name: str
+    init: Optional[Any] = None
+    is_const: bool = False
+
+
+@dataclass(slots=True)
+class Compound(Node):
+    statements: List[Node]
+
+
+@dataclass(slots=True)
+class If(Node):
+    cond: Any
+    then_branch: Any
+    else_branch: Optional[Any]
+
+
+@dataclass(slots=True)
+class While(Node):
+    cond: Any
+    body: Any
+
+
+@dataclass(slots=True)
+class For(Node):
+    init: Optional[Any]
+    cond: Optional[Any]
+    post: Optional[Any]
+    body: Any
+
+
+@dataclass(slots=True)
+class Return(Node):
+    expr: Optional[Any]
+
+
+@dataclass(slots=True)
+class ExprStmt(Node):
+    expr: Any
+
+
+@dataclass(slots=True)
+class BinaryOp(Node):
+    op: str
+    left: Any
+    right: Any
+
+
+@dataclass(slots=True)
+class UnaryOp(Node):
+    op: str
+    expr: Any
+
+
+@dataclass(slots=True)
+class Literal(Node):
+    value: Any
+    typ: int
+
+
+@dataclass(slots=True)
+class VarRef(Node):
+    name: str
+    # resolution result filled in by the semantic analyzer's name-resolution
+    # pass; excluded from repr/compare so the AST dump stays unchanged
+    _res: Optional[tuple] = field(default=None, repr=False, compare=False)
+
+
+@dataclass(slots=True)
+class FuncCall(Node):
+    name: str
+    args: List[Any]
@@ -1,59 +1,176 @@
-import re
-from dataclasses import dataclass
-from typing import List
-
-
-@dataclass
-class Token:
-    type: str
-    value: str
-    line: int
-    column: int
-
-
-class LexerError(Exception):
-    pass
-
-
-class Lexer:
-    KEYWORDS = {
-        'int', 'float', 'char', 'bool', 'if', 'else', 'for', 'while', 'do', 'return', 'const', 'true', 'false', 'void'
-    }
-
-    token_specification = [
-        ('COMMENT',   r'//.*'),
-        ('MULTICOMMENT', r'/\*[\s\S]*?\*/'),
-        ('CHAR',      r"'(?:\\.|[^\\'])'"),
-        ('FLOAT',     r'\d+\.\d+'),
-        ('INT',       r'\d+'),
-        ('ID',        r'[A-Za-z_][A-Za-z0-9_]*'),
-        ('OP',        r'==|!=|<=|>=|\|\||&&|\+\+|--|\+=|-=|\*=|/=|%='),
-        ('SYMBOL',    r'[+\-*/%<>=!&|.,;:(){}\[\]]'),
-        ('SKIP',      r'[ \t]+'),
-        ('NEWLINE',   r'\n'),
-    ]
-
-    def __init__(self, code: str):
-        self.code = code
-        parts = [f'(?P<{name}>{pattern})' for name, pattern in self.token_specification]
-        self.regex = re.compile('|'.join(parts))
-
-    def tokenize(self) -> List[Token]:
-        tokens: List[Token] = []
-        line_num = 1
-        line_start = 0
-        for mo in self.regex.finditer(self.code):
-            kind = mo.lastgroup
-            value = mo.group()
-            column = mo.start() - line_start + 1
-            if kind == 'NEWLINE':
-                line_num += 1
-                line_start = mo.end()
-                continue
-            if kind == 'SKIP' or kind == 'COMMENT' or kind == 'MULTICOMMENT':
-                continue
-            if kind == 'ID' and value in self.KEYWORDS:
-                kind = value
-            tokens.append(Token(kind, value, line_num, column))
-        tokens.append(Token('EOF', '', line_num, 1))
-        return tokens
+# cython: language_level=3, boundscheck=False, wraparound=False
+import sys
+from array import array
+from bisect import bisect_right
+from typing import ClassVar, List, NamedTuple, Optional
+
+# Prefer google/re2 when installed: it compiles the whole token spec to a
+# linear-time DFA and is much faster than the backtracking stdlib engine on
+# long alternations. The stdlib module is API-compatible for our usage.
+try:
+    import re2 as re  # type: ignore[import-not-found]
+except ImportError:
+    import re
+
+
+class Token(NamedTuple):
+    # Materialized from a TokenStream only for error messages; the parser
+    # reads the parallel arrays directly on the hot path.
+    type: str
+    value: str
+    line: int
+    column: int
+
+
+class TokenStream:
+    """Structure-of-arrays token buffer.
+
+    One list of kinds, one of values, and a compact int array of source
+    offsets instead of a list of Token objects: a fraction of the memory,
+    and line/column are only computed (via bisect over the newline
+    offsets) when a Token is materialized for an error message.
+    """
+
+    __slots__ = ('types', 'values', 'starts', 'line_offsets')
+
+    def __init__(self, types: List[str], values: List[str], starts: array, line_offsets: List[int]):
+        self.types = types
+        self.values = values
+        self.starts = starts
+        self.line_offsets = line_offsets
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def token_at(self, i: int) -> Token:
+        start = self.starts[i]
+        line = bisect_right(self.line_offsets, start)
+        return Token(self.types[i], self.values[i], line, start - self.line_offsets[line - 1])
+
+
+class LexerError(Exception):
+    pass
+
+
+# Optional compiled scanner backend. When the _lexer_scan extension (an
+# re2c-generated DFA wrapped in C) has been built for this platform, use it;
+# otherwise fall back to the pure-Python regex scanner below. The backend
+# returns the same (types, values, starts) parallel arrays; tokenize()
+# reapplies the interning contract to its strings, since the parser
+# dispatches on kinds and short values by identity.
+try:
+    from src._lexer_scan import tokenize_c as _tokenize_c  # type: ignore[import-not-found]
+except ImportError:
+    _tokenize_c = None
+
+
+class Lexer:
+    KEYWORDS: ClassVar[set] = {
+        'int', 'float', 'char', 'bool', 'if', 'else', 'for', 'while', 'do', 'return', 'const', 'true', 'false', 'void'
+    }
+
+    token_specification: ClassVar[list] = [
+        ('COMMENT',   r'//.*'),
+        ('MULTICOMMENT', r'/\*[\s\S]*?\*/'),
+        ('CHAR',      r"'(?:\\.|[^\\'])'"),
+        ('FLOAT',     r'\d+\.\d+'),
+        ('INT',       r'\d+'),
+        ('ID',        r'[A-Za-z_][A-Za-z0-9_]*'),
+        # multi-char operators first so '==' wins over '='; single-char
+        # punctuation folded into the same group so the parser dispatches
+        # on one kind
+        ('OP',        r'==|!=|<=|>=|\|\||&&|\+\+|--|\+=|-=|\*=|/=|%=|[+\-*/%<>=!&|.,;:(){}\[\]]'),
+        ('SKIP',      r'\s+'),
+    ]
+
+    # compiled once at import (see below): the spec is fixed, so
+    # per-instance recompilation was pure overhead when lexing many files
+    regex: ClassVar[Optional['re.Pattern']] = None
+
+    def __init__(self, code: str):
+        self.code = code
+        # offsets of the newline preceding each line (sentinel -1 for line 1),
+        # so (line, column) falls out of one bisect per materialized token
+        # instead of newline bookkeeping on every iteration
+        self.line_offsets = [-1]
+        self.line_offsets.extend(i for i, c in enumerate(code) if c == '\n')
+
+    _SKIPS: ClassVar[frozenset] = frozenset(('SKIP', 'COMMENT', 'MULTICOMMENT'))
+
+    def tokenize(self) -> TokenStream:
+        if _tokenize_c is not None:
+            ctypes, cvalues, cstarts = _tokenize_c(self.code)
+            # The backend's strings are not interned; rebuild the arrays
+            # through the same interning rules as the Python scanner so
+            # the parser's identity comparisons keep working, and append
+            # the EOF sentinel if the backend didn't.
+            c_intern = sys.intern
+            ctypes = [c_intern(t) for t in ctypes]
+            cvalues = [c_intern(v) if len(v) < 4 else v for v in cvalues]
+            if not ctypes or ctypes[-1] is not c_intern('EOF'):
+                ctypes.append('EOF')
+                cvalues.append('')
+                cstarts.append(len(self.code))
+            return TokenStream(ctypes, cvalues, cstarts, self.line_offsets)
+        types: List[str] = []
+        values: List[str] = []
+        starts = array('i')
+        # bind everything the loop touches to locals once
+        KW = Lexer.KEYWORDS
+        SKIPS = Lexer._SKIPS
+        types_append = types.append
+        values_append = values.append
+        starts_append = starts.append
+        intern = sys.intern
+        regex = self.regex
+        assert regex is not None  # set at import, below
+        for mo in regex.finditer(self.code):
+            kind = mo.lastgroup
+            if kind in SKIPS:
+                continue
+            value = mo.group()
+            if kind == 'ID' and value in KW:
+                kind = value
+            # Intern kinds and short values (keywords, punctuation, small
+            # operators) so the parser can compare them by identity.
+            types_append(intern(kind))
+            values_append(intern(value) if len(value) < 4 else value)
+            starts_append(mo.start())
+        types_append('EOF')
+        values_append('')
+        starts_append(len(self.code))
+        return TokenStream(types, values, starts, self.line_offsets)
+
+
+def _pattern_src() -> str:
+    return '|'.join(f'(?P<{name}>{pattern})' for name, pattern in Lexer.token_specification)
+
+
+# PLY-style frozen table: `python -m src.lexer --generate-tab` writes
+# _lextab.py with the assembled pattern source, so runtime skips the
+# pattern-building step and just compiles a literal string. The spec above
+# stays the source of truth; regenerate the tab after editing it. KEYWORDS
+# is a plain set lookup with no assembly step, so the in-source literal
+# stays authoritative and is not frozen into the tab.
+try:
+    from src import _lextab
+    Lexer.regex = re.compile(_lextab.PATTERN_SRC)
+except ImportError:
+    Lexer.regex = re.compile(_pattern_src())
+
+
+def _generate_tab() -> str:
+    import os
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_lextab.py')
+    with open(path, 'w', encoding='utf8') as out:
+        out.write('# Generated by `python -m src.lexer --generate-tab`. Do not edit;\n')
+        out.write('# regenerate after changing Lexer.token_specification.\n')
+        out.write(f'PATTERN_SRC = {_pattern_src()!r}\n')
+    return path
+
+
+if __name__ == '__main__':
+    if '--generate-tab' in sys.argv:
+        print('wrote', _generate_tab())
+    else:
+        print('usage: python -m src.lexer --generate-tab')
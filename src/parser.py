@@ -1,272 +1,334 @@
-from typing import List, Optional
-from src.lexer import Lexer, Token
-from src import ast as _ast
-
-
-class ParseError(Exception):
-    pass
-
-
-class Parser:
-    def __init__(self, code: str):
-        self.lexer = Lexer(code)
-        self.tokens: List[Token] = self.lexer.tokenize()
-        self.pos = 0
-
-    def peek(self) -> Token:
-        return self.tokens[self.pos]
-
-    def next(self) -> Token:
-        tok = self.tokens[self.pos]
-        self.pos += 1
-        return tok
-
-    def expect(self, typ: str, value: Optional[str] = None) -> Token:
-        tok = self.peek()
-        if tok.type != typ and (value is None or tok.value != value):
-            raise ParseError(f'Expected {typ} {value or ""} got {tok.type} {tok.value} at {tok.line}:{tok.column}')
-        return self.next()
-
-    def parse(self) -> _ast.Program:
-        decls = []
-        while self.peek().type != 'EOF':
-            d = self.parse_declaration()
-            # allow declaration to return a list of decls (multiple declarators)
-            if isinstance(d, list):
-                decls.extend(d)
-            else:
-                decls.append(d)
-        return _ast.Program(decls)
-
-    def parse_declaration(self):
-        tok = self.peek()
-        # allow optional `const` prefix
-        if tok.type == 'const':
-            return self.parse_typed_declaration()
-        if tok.type in ('int', 'float', 'char', 'bool', 'void') or tok.type.upper() in ('INT','FLOAT','CHAR','BOOL','VOID'):
-            return self.parse_typed_declaration()
-        raise ParseError(f'Unexpected token {tok.type} at {tok.line}:{tok.column}')
-
-    def parse_typed_declaration(self):
-        is_const = False
-        tok = self.peek()
-        if tok.type == 'const':
-            is_const = True
-            self.next()
-        typ = self.next().value
-        # read the identifier (name) first to decide whether function or variables
-        name_tok = self.expect('ID')
-        name = name_tok.value
-
-        # function or variable: if next is '(', it's a function
-        if self.peek().value == '(':
-            # function
-            self.next()  # (
-            params = []
-            if self.peek().value != ')':
-                while True:
-                    ptype = self.next().value
-                    pname = self.expect('ID').value
-                    params.append((ptype, pname))
-                    if self.peek().value == ',':
-                        self.next()
-                        continue
-                    break
-            self.expect('SYMBOL', ')')
-            body = self.parse_compound()
-            return _ast.FuncDecl(typ, name, params, body)
-        else:
-            # variable declaration(s) — support comma-separated declarators
-            decls = []
-            decls.append(_ast.VarDecl(typ, name, None, is_const))
-            # if the first declarator has initializer, handle it
-            if self.peek().value == '=' or (self.peek().type == 'OP' and self.peek().value == '='):
-                self.next()
-                decls[-1].init = self.parse_expression()
-            while self.peek().value == ',':
-                self.next()
-                # parse next declarator names
-                next_name = self.expect('ID').value
-                init = None
-                if self.peek().value == '=' or (self.peek().type == 'OP' and self.peek().value == '='):
-                    self.next()
-                    init = self.parse_expression()
-                decls.append(_ast.VarDecl(typ, next_name, init, is_const))
-            self.expect('SYMBOL',';')
-            return decls
-
-    def parse_compound(self):
-        # expect '{'
-        if self.peek().value != '{':
-            raise ParseError('Expected { for compound')
-        self.next()
-        stmts = []
-        while self.peek().value != '}':
-            s = self.parse_statement()
-            if isinstance(s, list):
-                stmts.extend(s)
-            else:
-                stmts.append(s)
-        self.next()
-        return _ast.Compound(stmts)
-
-    def parse_statement(self):
-        tok = self.peek()
-        if tok.type == 'return':
-            self.next()
-            if self.peek().value == ';':
-                self.next()
-                return _ast.Return(None)
-            expr = self.parse_expression()
-            self.expect('SYMBOL',';')
-            return _ast.Return(expr)
-        if tok.value == '{':
-            return self.parse_compound()
-        if tok.type == 'if':
-            self.next()
-            self.expect('SYMBOL','(')
-            cond = self.parse_expression()
-            self.expect('SYMBOL',')')
-            thenb = self.parse_statement()
-            elseb = None
-            if self.peek().type == 'else':
-                self.next()
-                elseb = self.parse_statement()
-            return _ast.If(cond, thenb, elseb)
-        if tok.type == 'while':
-            self.next()
-            self.expect('SYMBOL','(')
-            cond = self.parse_expression()
-            self.expect('SYMBOL',')')
-            body = self.parse_statement()
-            return _ast.While(cond, body)
-        if tok.type == 'for':
-            self.next()
-            self.expect('SYMBOL','(')
-            # init: could be declaration, expression, or empty
-            if self.peek().value == ';':
-                init = None
-                self.next()
-            else:
-                if self.peek().type in ('int','float','char','bool','const'):
-                    init = self.parse_declaration()
-                else:
-                    init = self.parse_expression()
-                    self.expect('SYMBOL',';')
-            # cond
-            if self.peek().value == ';':
-                cond = None
-                self.next()
-            else:
-                cond = self.parse_expression()
-                self.expect('SYMBOL',';')
-            # post
-            if self.peek().value == ')':
-                post = None
-            else:
-                post = self.parse_expression()
-            self.expect('SYMBOL',')')
-            body = self.parse_statement()
-            return _ast.For(init, cond, post, body)
-        if tok.type == 'do':
-            self.next()
-            body = self.parse_statement()
-            if self.peek().type != 'while':
-                raise ParseError('Expected while after do-block')
-            self.next()
-            self.expect('SYMBOL','(')
-            cond = self.parse_expression()
-            self.expect('SYMBOL',')')
-            self.expect('SYMBOL',';')
-            return _ast.While(cond, body)
-        # for, do etc omitted for brevity; can extend similarly
-        # expression or declaration
-        if tok.type in ('int','float','char','bool','const'):
-            # local var decl
-            return self.parse_typed_declaration()
-        # expression statement
-        expr = self.parse_expression()
-        self.expect('SYMBOL',';')
-        return _ast.ExprStmt(expr)
-
-    # Expression parser (precedence climbing)
-    PRECEDENCE = {
-        '||': 1,
-        '&&': 2,
-        '==': 3, '!=': 3,
-        '<': 4, '>': 4, '<=': 4, '>=': 4,
-        '+': 5, '-': 5,
-        '*': 6, '/': 6, '%': 6,
-        '=': 0,
-        '+=': 0, '-=': 0, '*=': 0, '/=': 0, '%=': 0,
-    }
-
-    def parse_expression(self, min_prec=0):
-        tok = self.peek()
-        # handle unary prefix operators: !, +, -, ++, --
-        if tok.value in ('!','+','-','++','--'):
-            op = tok.value
-            self.next()
-            # unary has higher precedence than multiplicative
-            expr = self.parse_expression(7)
-            return _ast.UnaryOp(op if op not in ('++','--') else f'pre{op}', expr)
-
-        # primary
-        if tok.type == 'INT':
-            self.next()
-            left = _ast.Literal(int(tok.value), 'int')
-        elif tok.type == 'FLOAT':
-            self.next()
-            left = _ast.Literal(float(tok.value), 'float')
-        elif tok.type == 'CHAR':
-            self.next()
-            val = tok.value[1:-1]
-            left = _ast.Literal(val, 'char')
-        elif tok.type in ('true','false'):
-            self.next()
-            left = _ast.Literal(True if tok.type == 'true' else False, 'bool')
-        elif tok.type == 'ID':
-            idtok = self.next()
-            if self.peek().value == '(':
-                # function call
-                self.next()
-                args = []
-                if self.peek().value != ')':
-                    while True:
-                        args.append(self.parse_expression())
-                        if self.peek().value == ',':
-                            self.next()
-                            continue
-                        break
-                self.expect('SYMBOL',')')
-                left = _ast.FuncCall(idtok.value, args)
-            else:
-                left = _ast.VarRef(idtok.value)
-        elif tok.value == '(':
-            self.next()
-            left = self.parse_expression()
-            self.expect('SYMBOL',')')
-        else:
-            raise ParseError(f'Unexpected expression token {tok.type} {tok.value} at {tok.line}:{tok.column}')
-
-        # handle postfix ++/-- (higher precedence than binary ops)
-        while self.peek().value in ('++','--'):
-            op = self.next().value
-            left = _ast.UnaryOp(f'post{op}', left)
-
-        while True:
-            op_tok = self.peek()
-            op = op_tok.value
-            if op_tok.type in ('OP','SYMBOL') and op in self.PRECEDENCE and self.PRECEDENCE[op] >= min_prec:
-                prec = self.PRECEDENCE[op]
-                self.next()
-                # right-assoc for assignment and compound assignment
-                if op in ('=', '+=', '-=', '*=', '/=', '%='):
-                    next_min = prec
-                else:
-                    next_min = prec + 1
-                right = self.parse_expression(next_min)
-                left = _ast.BinaryOp(op, left, right)
-                continue
-            break
-        return left
+# cython: language_level=3, boundscheck=False, wraparound=False
+from typing import Any, ClassVar, List, Optional
+from src.lexer import Lexer, Token, TokenStream
+from src import ast as _ast
+import sys
+
+# The lexer interns token kinds and short values, so hot-path dispatch can
+# compare by identity (a pointer test) instead of string equality.
+_intern = sys.intern
+_EOF = _intern('EOF')
+_ID = _intern('ID')
+_INT = _intern('INT')
+_FLOAT = _intern('FLOAT')
+_CHAR = _intern('CHAR')
+_OP = _intern('OP')
+_CONST = _intern('const')
+_RETURN = _intern('return')
+_IF = _intern('if')
+_ELSE = _intern('else')
+_WHILE = _intern('while')
+_FOR = _intern('for')
+_DO = _intern('do')
+_TRUE = _intern('true')
+_FALSE = _intern('false')
+_LPAREN = _intern('(')
+_RPAREN = _intern(')')
+_LBRACE = _intern('{')
+_RBRACE = _intern('}')
+_COMMA = _intern(',')
+_SEMI = _intern(';')
+_EQ = _intern('=')
+
+# operator classes used by parse_expression; frozensets give O(1) membership
+_UNARY = frozenset(('!', '+', '-', '++', '--'))
+_ASSIGN = frozenset(('=', '+=', '-=', '*=', '/=', '%='))
+_POSTFIX = frozenset(('++', '--'))
+
+# textual type name -> Ty code, applied when declarations and literals are
+# constructed so the semantic pass only ever sees integer codes
+_TY = _ast.Ty._byname
+_TY_INT = _ast.Ty.INT
+_TY_FLOAT = _ast.Ty.FLOAT
+_TY_CHAR = _ast.Ty.CHAR
+_TY_BOOL = _ast.Ty.BOOL
+
+
+class ParseError(Exception):
+    pass
+
+
+class Parser:
+    def __init__(self, code: str):
+        self.lexer = Lexer(code)
+        self.stream: TokenStream = self.lexer.tokenize()
+        # parallel arrays: the hot path reads kinds and values directly and
+        # only materializes a Token (with line/column) for error messages
+        self.types: List[str] = self.stream.types
+        self.values: List[str] = self.stream.values
+        self.pos: int = 0
+
+    # peek/next remain for cold paths and materialize a full Token
+    def peek(self) -> Token:
+        return self.stream.token_at(self.pos)
+
+    def next(self) -> Token:
+        tok = self.stream.token_at(self.pos)
+        self.pos += 1
+        return tok
+
+    def expect(self, typ: str, value: Optional[str] = None) -> str:
+        i = self.pos
+        if self.types[i] != typ and (value is None or self.values[i] != value):
+            tok = self.stream.token_at(i)
+            raise ParseError(f'Expected {typ} {value or ""} got {tok.type} {tok.value} at {tok.line}:{tok.column}')
+        self.pos += 1
+        return self.values[i]
+
+    def parse(self) -> _ast.Program:
+        types = self.types
+        decls = []
+        while types[self.pos] is not _EOF:
+            # declarations always come back as a list of nodes
+            decls.extend(self.parse_declaration())
+        return _ast.Program(decls)
+
+    def parse_declaration(self) -> List[_ast.Node]:
+        typ = self.types[self.pos]
+        # allow optional `const` prefix
+        if typ is _CONST:
+            return self.parse_typed_declaration()
+        if typ in ('int', 'float', 'char', 'bool', 'void') or typ.upper() in ('INT','FLOAT','CHAR','BOOL','VOID'):
+            return self.parse_typed_declaration()
+        tok = self.stream.token_at(self.pos)
+        raise ParseError(f'Unexpected token {tok.type} at {tok.line}:{tok.column}')
+
+    def parse_typed_declaration(self) -> List[_ast.Node]:
+        types = self.types
+        values = self.values
+        is_const = False
+        if types[self.pos] is _CONST:
+            is_const = True
+            self.pos += 1
+        typ = _TY.get(values[self.pos], _ast.Ty.INT)
+        self.pos += 1
+        # read the identifier (name) first to decide whether function or variables
+        name = self.expect('ID')
+
+        # function or variable: if next is '(', it's a function
+        if values[self.pos] is _LPAREN:
+            # function
+            self.pos += 1
+            params = []
+            if values[self.pos] is not _RPAREN:
+                while True:
+                    ptype = _TY.get(values[self.pos], _ast.Ty.INT)
+                    self.pos += 1
+                    pname = self.expect('ID')
+                    params.append((ptype, pname))
+                    if values[self.pos] is _COMMA:
+                        self.pos += 1
+                        continue
+                    break
+            self.expect('OP', ')')
+            body = self.parse_compound()
+            return [_ast.FuncDecl(typ, name, params, body)]
+        else:
+            # variable declaration(s) — support comma-separated declarators
+            # parse the first declarator's initializer before constructing
+            # the node, so VarDecl is never mutated after creation
+            init = None
+            if values[self.pos] is _EQ:
+                self.pos += 1
+                init = self.parse_expression()
+            decls: List[_ast.Node] = [_ast.VarDecl(typ, name, init, is_const)]
+            while values[self.pos] is _COMMA:
+                self.pos += 1
+                # parse next declarator names
+                next_name = self.expect('ID')
+                init = None
+                if values[self.pos] is _EQ:
+                    self.pos += 1
+                    init = self.parse_expression()
+                decls.append(_ast.VarDecl(typ, next_name, init, is_const))
+            self.expect('OP',';')
+            return decls
+
+    def parse_compound(self) -> _ast.Compound:
+        types = self.types
+        values = self.values
+        # expect '{'
+        if values[self.pos] is not _LBRACE:
+            raise ParseError('Expected { for compound')
+        self.pos += 1
+        stmts = []
+        while values[self.pos] is not _RBRACE:
+            # note: no 'void' here — void variable declarations are rejected
+            if types[self.pos] in ('int', 'float', 'char', 'bool', 'const'):
+                # local declaration(s): always a list, so always extend
+                stmts.extend(self.parse_typed_declaration())
+            else:
+                stmts.append(self.parse_statement())
+        self.pos += 1
+        return _ast.Compound(stmts)
+
+    def parse_statement(self) -> _ast.Node:
+        types = self.types
+        values = self.values
+        typ = types[self.pos]
+        cond: Optional[_ast.Node]  # shared by the if/while/for/do branches
+        if typ is _RETURN:
+            self.pos += 1
+            if values[self.pos] is _SEMI:
+                self.pos += 1
+                return _ast.Return(None)
+            expr = self.parse_expression()
+            self.expect('OP',';')
+            return _ast.Return(expr)
+        if values[self.pos] is _LBRACE:
+            return self.parse_compound()
+        if typ is _IF:
+            self.pos += 1
+            self.expect('OP','(')
+            cond = self.parse_expression()
+            self.expect('OP',')')
+            thenb = self.parse_statement()
+            elseb = None
+            if types[self.pos] is _ELSE:
+                self.pos += 1
+                elseb = self.parse_statement()
+            return _ast.If(cond, thenb, elseb)
+        if typ is _WHILE:
+            self.pos += 1
+            self.expect('OP','(')
+            cond = self.parse_expression()
+            self.expect('OP',')')
+            body = self.parse_statement()
+            return _ast.While(cond, body)
+        if typ is _FOR:
+            self.pos += 1
+            self.expect('OP','(')
+            # init: could be declaration, expression, or empty
+            init: Optional[Any]
+            if values[self.pos] is _SEMI:
+                init = None
+                self.pos += 1
+            else:
+                if types[self.pos] in ('int','float','char','bool','const'):
+                    init = self.parse_declaration()
+                else:
+                    init = self.parse_expression()
+                    self.expect('OP',';')
+            # cond
+            if values[self.pos] is _SEMI:
+                cond = None
+                self.pos += 1
+            else:
+                cond = self.parse_expression()
+                self.expect('OP',';')
+            # post
+            post: Optional[_ast.Node]
+            if values[self.pos] is _RPAREN:
+                post = None
+            else:
+                post = self.parse_expression()
+            self.expect('OP',')')
+            body = self.parse_statement()
+            return _ast.For(init, cond, post, body)
+        if typ is _DO:
+            self.pos += 1
+            body = self.parse_statement()
+            if types[self.pos] is not _WHILE:
+                raise ParseError('Expected while after do-block')
+            self.pos += 1
+            self.expect('OP','(')
+            cond = self.parse_expression()
+            self.expect('OP',')')
+            self.expect('OP',';')
+            return _ast.While(cond, body)
+        if typ in ('int', 'float', 'char', 'bool', 'const'):
+            # declaration in statement position (e.g. an unbraced if
+            # branch): wrap the declarator list in a Compound so a
+            # single node comes back; 'void' is excluded, as above
+            return _ast.Compound(self.parse_typed_declaration())
+        # for, do etc omitted for brevity; can extend similarly
+        # expression statement
+        expr = self.parse_expression()
+        self.expect('OP',';')
+        return _ast.ExprStmt(expr)
+
+    # Expression parser (precedence climbing)
+    PRECEDENCE: ClassVar[dict] = {
+        '||': 1,
+        '&&': 2,
+        '==': 3, '!=': 3,
+        '<': 4, '>': 4, '<=': 4, '>=': 4,
+        '+': 5, '-': 5,
+        '*': 6, '/': 6, '%': 6,
+        '=': 0,
+        '+=': 0, '-=': 0, '*=': 0, '/=': 0, '%=': 0,
+    }
+
+    def parse_expression(self, min_prec: int = 0) -> _ast.Node:
+        types = self.types
+        values = self.values
+        typ = types[self.pos]
+        value = values[self.pos]
+        # handle unary prefix operators: !, +, -, ++, --
+        if value in _UNARY:
+            self.pos += 1
+            # unary has higher precedence than multiplicative
+            expr = self.parse_expression(7)
+            return _ast.UnaryOp(value if value not in _POSTFIX else f'pre{value}', expr)
+
+        # primary
+        left: _ast.Node
+        if typ is _INT:
+            self.pos += 1
+            left = _ast.Literal(int(value), _TY_INT)
+        elif typ is _FLOAT:
+            self.pos += 1
+            left = _ast.Literal(float(value), _TY_FLOAT)
+        elif typ is _CHAR:
+            self.pos += 1
+            left = _ast.Literal(value[1:-1], _TY_CHAR)
+        elif typ is _TRUE or typ is _FALSE:
+            self.pos += 1
+            left = _ast.Literal(typ is _TRUE, _TY_BOOL)
+        elif typ is _ID:
+            self.pos += 1
+            if values[self.pos] is _LPAREN:
+                # function call
+                self.pos += 1
+                args = []
+                if values[self.pos] is not _RPAREN:
+                    while True:
+                        args.append(self.parse_expression())
+                        if values[self.pos] is _COMMA:
+                            self.pos += 1
+                            continue
+                        break
+                self.expect('OP',')')
+                left = _ast.FuncCall(value, args)
+            else:
+                left = _ast.VarRef(value)
+        elif value is _LPAREN:
+            self.pos += 1
+            left = self.parse_expression()
+            self.expect('OP',')')
+        else:
+            tok = self.stream.token_at(self.pos)
+            raise ParseError(f'Unexpected expression token {tok.type} {tok.value} at {tok.line}:{tok.column}')
+
+        # handle postfix ++/-- (higher precedence than binary ops)
+        while values[self.pos] in _POSTFIX:
+            op = values[self.pos]
+            self.pos += 1
+            left = _ast.UnaryOp(f'post{op}', left)
+
+        PREC = Parser.PRECEDENCE
+        while True:
+            if types[self.pos] is not _OP:
+                break
+            op = values[self.pos]
+            # fused lookup-and-check: -1 fails the min_prec test for
+            # anything that isn't a binary operator
+            prec = PREC.get(op, -1)
+            if prec < min_prec:
+                break
+            self.pos += 1
+            # right-assoc for assignment and compound assignment
+            next_min = prec if op in _ASSIGN else prec + 1
+            right = self.parse_expression(next_min)
+            left = _ast.BinaryOp(op, left, right)
+        return left
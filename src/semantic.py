@@ -1,168 +1,303 @@
-from typing import Dict, List
-from src import ast as _ast
-
-
-class SemanticError(Exception):
-    pass
-
-
-class SemanticAnalyzer:
-    def __init__(self, program: _ast.Program):
-        self.program = program
-        self.errors: List[str] = []
-        # map name -> (type, is_const)
-        self.global_scope: Dict[str, tuple] = {}
-        self.functions: Dict[str, _ast.FuncDecl] = {}
-
-    def analyze(self):
-        # collect globals and functions
-        for decl in self.program.declarations:
-            if isinstance(decl, _ast.VarDecl):
-                if decl.name in self.global_scope:
-                    self.errors.append(f'Redeclaration of global {decl.name}')
-                else:
-                    self.global_scope[decl.name] = (decl.var_type, decl.is_const)
-            elif isinstance(decl, _ast.FuncDecl):
-                if decl.name in self.functions:
-                    self.errors.append(f'Redeclaration of function {decl.name}')
-                else:
-                    self.functions[decl.name] = decl
-        # analyze functions
-        for fname, fdecl in self.functions.items():
-            self.check_function(fdecl)
-
-    def check_function(self, f: _ast.FuncDecl):
-        # simple local scope: map name -> (type, is_const)
-        scope = { name: (typ, False) for typ, name in f.params }
-
-        def infer_type(node):
-            if node is None:
-                return None
-            t = type(node)
-            if t is _ast.Literal:
-                return node.typ
-            if t is _ast.UnaryOp:
-                op = node.op
-                if op in ('!') or op == 'pre!' or op == 'post!':
-                    return 'bool'
-                if op in ('pre++','pre--','post++','post--'):
-                    # result type is the operand type if numeric
-                    return infer_type(node.expr)
-                if op in ('+','-'):
-                    return infer_type(node.expr)
-            if t is _ast.VarRef:
-                if node.name in scope:
-                    return scope[node.name][0]
-                if node.name in self.global_scope:
-                    return self.global_scope[node.name][0]
-                if node.name in self.functions:
-                    # function name used as value is not allowed
-                    self.errors.append(f'Function {node.name} used as value in function {f.name}')
-                    return None
-                self.errors.append(f'Use of undeclared identifier {node.name} in function {f.name}')
-                return None
-            if t is _ast.FuncCall:
-                if node.name not in self.functions:
-                    self.errors.append(f'Call to undeclared function {node.name} in function {f.name}')
-                    return None
-                callee = self.functions[node.name]
-                if len(node.args) != len(callee.params):
-                    self.errors.append(f'Wrong number of arguments in call to {node.name} in function {f.name}')
-                # check arg types
-                for i, a in enumerate(node.args):
-                    at = infer_type(a)
-                    if i < len(callee.params):
-                        expected = callee.params[i][0]
-                        if at and expected and at != expected:
-                            # allow int->float
-                            if not (at == 'int' and expected == 'float'):
-                                self.errors.append(f'Type mismatch for argument {i+1} in call to {node.name}: expected {expected}, got {at}')
-                return callee.ret_type
-            if t is _ast.UnaryOp:
-                return infer_type(node.expr)
-            if t is _ast.BinaryOp:
-                op = node.op
-                ltype = infer_type(node.left)
-                rtype = infer_type(node.right)
-                if op in ('+', '-', '*', '/', '%'):
-                    if ltype == 'float' or rtype == 'float':
-                        return 'float'
-                    return 'int'
-                if op in ('==','!=','<','>','<=','>='):
-                    return 'bool'
-                if op in ('&&','||'):
-                    return 'bool'
-                if op in ('=','+=','-=','*=','/=','%='):
-                    # assignment: type of lhs
-                    if isinstance(node.left, _ast.VarRef):
-                        lname = node.left.name
-                        if lname in scope:
-                            return scope[lname][0]
-                        if lname in self.global_scope:
-                            return self.global_scope[lname][0]
-                    return None
-            return None
-
-        def visit(node):
-            if node is None:
-                return None
-            t = type(node)
-            if t is _ast.Compound:
-                for s in node.statements:
-                    visit(s)
-            elif t is _ast.VarDecl:
-                if node.name in scope:
-                    self.errors.append(f'Redeclaration of {node.name} in function {f.name}')
-                scope[node.name] = (node.var_type, node.is_const)
-                if node.init:
-                    it = infer_type(node.init)
-                    if it and it != node.var_type:
-                        if not (it == 'int' and node.var_type == 'float'):
-                            self.errors.append(f'Type mismatch in initializer for {node.name}: {it} -> {node.var_type} in function {f.name}')
-                    visit(node.init)
-            elif t is _ast.If:
-                visit(node.cond)
-                visit(node.then_branch)
-                if node.else_branch:
-                    visit(node.else_branch)
-            elif t is _ast.While:
-                visit(node.cond)
-                visit(node.body)
-            elif t is _ast.Return:
-                if node.expr:
-                    rtype = infer_type(node.expr)
-                    if f.ret_type != 'void':
-                        if rtype and rtype != f.ret_type:
-                            if not (rtype == 'int' and f.ret_type == 'float'):
-                                self.errors.append(f'Return type mismatch in function {f.name}: expected {f.ret_type}, got {rtype}')
-                    visit(node.expr)
-            elif t is _ast.ExprStmt:
-                visit(node.expr)
-            elif t is _ast.BinaryOp:
-                # check assignment to const
-                if node.op in ('=','+=','-=','*=','/=','%='):
-                    if isinstance(node.left, _ast.VarRef):
-                        lname = node.left.name
-                        if lname in scope and scope[lname][1]:
-                            self.errors.append(f'Assignment to const variable {lname} in function {f.name}')
-                        if lname in self.global_scope and self.global_scope[lname][1]:
-                            self.errors.append(f'Assignment to const global {lname} in function {f.name}')
-                visit(node.left)
-                visit(node.right)
-            elif t is _ast.UnaryOp:
-                visit(node.expr)
-            elif t is _ast.VarRef:
-                if node.name not in scope and node.name not in self.global_scope and node.name not in self.functions:
-                    self.errors.append(f'Use of undeclared identifier {node.name} in function {f.name}')
-            elif t is _ast.FuncCall:
-                if node.name not in self.functions:
-                    self.errors.append(f'Call to undeclared function {node.name} in function {f.name}')
-                for a in node.args:
-                    visit(a)
-            elif t is _ast.Literal:
-                pass
-            else:
-                # unknown node types
-                pass
-
-        visit(f.body)
+from typing import Dict, List
+from src import ast as _ast
+
+
+class SemanticError(Exception):
+    pass
+
+
+# Analysis dispatches on each node's concrete class through the _CHECK and
+# _STEP tables below: one dict lookup per node instead of a ladder of
+# identity comparisons. The handlers are module-level functions taking
+# (self, f, scope, node) so the tables can be built once at import.
+
+_Ty = _ast.Ty
+
+_ASSIGN_OPS = frozenset(('=', '+=', '-=', '*=', '/=', '%='))
+_ARITH_OPS = frozenset(('+', '-', '*', '/', '%'))
+_BOOL_OPS = frozenset(('==', '!=', '<', '>', '<=', '>=', '&&', '||'))
+
+
+def _tyname(t):
+    # error messages still show the textual type name
+    return _Ty._name.get(t, t)
+
+
+# Expression checking is a single post-order pass that computes each node's
+# type and emits its diagnostics (const writes, call errors) on the way up,
+# so expression trees are traversed once instead of once for inference and
+# again for checking.
+
+def _check_expr(self, f, scope, node):
+    if node is None:
+        return None
+    fn = _CHECK.get(type(node))
+    return fn(self, f, scope, node) if fn is not None else None
+
+
+def _check_literal(self, f, scope, node):
+    return node.typ
+
+
+def _check_unary(self, f, scope, node):
+    t = _check_expr(self, f, scope, node.expr)
+    op = node.op
+    if op in ('!') or op == 'pre!' or op == 'post!':
+        return _Ty.BOOL
+    if op in ('pre++', 'pre--', 'post++', 'post--', '+', '-'):
+        # result type is the operand type if numeric
+        return t
+    return None
+
+
+def _check_varref(self, f, scope, node):
+    # resolved once by _resolve; ('local'|'global', type, is_const)
+    res = node._res
+    if res is not None and (res[0] == 'local' or res[0] == 'global'):
+        return res[1]
+    return None
+
+
+def _check_funccall(self, f, scope, node):
+    if node.name not in self.functions:
+        self.errors.append(f'Call to undeclared function {node.name} in function {f.name}')
+        # the arguments still need their own checks
+        for a in node.args:
+            _check_expr(self, f, scope, a)
+        return None
+    callee = self.functions[node.name]
+    if len(node.args) != len(callee.params):
+        self.errors.append(f'Wrong number of arguments in call to {node.name} in function {f.name}')
+    # check arg types
+    for i, a in enumerate(node.args):
+        at = _check_expr(self, f, scope, a)
+        if i < len(callee.params):
+            expected = callee.params[i][0]
+            if at and expected and at != expected:
+                # allow int->float
+                if not (at == _Ty.INT and expected == _Ty.FLOAT):
+                    self.errors.append(f'Type mismatch for argument {i+1} in call to {node.name}: expected {_tyname(expected)}, got {_tyname(at)}')
+    return callee.ret_type
+
+
+def _check_binary(self, f, scope, node):
+    op = node.op
+    if op in _ASSIGN_OPS:
+        # check assignment to const against the resolved binding
+        left = node.left
+        ltype = None
+        if isinstance(left, _ast.VarRef):
+            res = left._res
+            if res is not None:
+                if res[0] == 'local':
+                    ltype = res[1]
+                    if res[2]:
+                        self.errors.append(f'Assignment to const variable {left.name} in function {f.name}')
+                elif res[0] == 'global':
+                    ltype = res[1]
+                    if res[2]:
+                        self.errors.append(f'Assignment to const global {left.name} in function {f.name}')
+        else:
+            _check_expr(self, f, scope, left)
+        _check_expr(self, f, scope, node.right)
+        # assignment: type of lhs
+        return ltype
+    ltype = _check_expr(self, f, scope, node.left)
+    rtype = _check_expr(self, f, scope, node.right)
+    if op in _ARITH_OPS:
+        if ltype == _Ty.FLOAT or rtype == _Ty.FLOAT:
+            return _Ty.FLOAT
+        return _Ty.INT
+    if op in _BOOL_OPS:
+        return _Ty.BOOL
+    return None
+
+
+_CHECK = {
+    _ast.Literal: _check_literal,
+    _ast.UnaryOp: _check_unary,
+    _ast.VarRef: _check_varref,
+    _ast.FuncCall: _check_funccall,
+    _ast.BinaryOp: _check_binary,
+}
+
+
+def _visit(self, f, scope, node):
+    # Explicit-stack pre-order walk over statements: no Python frame per
+    # node and no RecursionError on deeply nested input. Each node type
+    # gets a _STEP function generated at import that runs its checks and
+    # pushes its statement children; expressions are handled by the fused
+    # _check_expr pass inside the handlers.
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        n = pop()
+        if n is None:
+            continue
+        step = _STEP.get(type(n))
+        if step is not None:
+            step(self, f, scope, n, stack)
+
+
+def _pre_vardecl(self, f, scope, node):
+    if node.name in scope:
+        self.errors.append(f'Redeclaration of {node.name} in function {f.name}')
+    scope[node.name] = (node.var_type, node.is_const)
+    if node.init:
+        it = _check_expr(self, f, scope, node.init)
+        if it and it != node.var_type:
+            if not (it == _Ty.INT and node.var_type == _Ty.FLOAT):
+                self.errors.append(f'Type mismatch in initializer for {node.name}: {_tyname(it)} -> {_tyname(node.var_type)} in function {f.name}')
+
+
+def _pre_return(self, f, scope, node):
+    if node.expr:
+        rtype = _check_expr(self, f, scope, node.expr)
+        if f.ret_type != _Ty.VOID:
+            if rtype and rtype != f.ret_type:
+                if not (rtype == _Ty.INT and f.ret_type == _Ty.FLOAT):
+                    self.errors.append(f'Return type mismatch in function {f.name}: expected {_tyname(f.ret_type)}, got {_tyname(rtype)}')
+
+
+def _pre_if(self, f, scope, node):
+    _check_expr(self, f, scope, node.cond)
+
+
+def _pre_while(self, f, scope, node):
+    _check_expr(self, f, scope, node.cond)
+
+
+def _pre_exprstmt(self, f, scope, node):
+    _check_expr(self, f, scope, node.expr)
+
+
+# (check handler or None, statement children in source order with a flag
+# marking list-valued fields). Expression fields are consumed by the
+# handlers via _check_expr rather than walked. Node types without an entry
+# — Literal, and For, which the recursive visitor never walked — are no-ops.
+_NODE_SPECS = {
+    _ast.Compound: (None, (('statements', True),)),
+    _ast.VarDecl: (_pre_vardecl, ()),
+    _ast.If: (_pre_if, (('then_branch', False), ('else_branch', False))),
+    _ast.While: (_pre_while, (('body', False),)),
+    _ast.Return: (_pre_return, ()),
+    _ast.ExprStmt: (_pre_exprstmt, ()),
+}
+
+
+def _make_step(pre, fields):
+    # Compile a step function specialized to one node type: the field
+    # names are literal attribute accesses and children are pushed
+    # individually in reverse, so the generic accessor call, tuple
+    # allocation and reversed() iterator all disappear.
+    lines = ['def _step(self, f, scope, n, stack):']
+    if pre is not None:
+        lines.append('    _pre(self, f, scope, n)')
+    for name, is_list in reversed(fields):
+        if is_list:
+            lines.append(f'    stack.extend(reversed(n.{name}))')
+        else:
+            lines.append(f'    stack.append(n.{name})')
+    if len(lines) == 1:
+        lines.append('    pass')
+    ns = {'_pre': pre}
+    exec('\n'.join(lines), ns)
+    return ns['_step']
+
+
+_STEP = {cls: _make_step(pre, fields) for cls, (pre, fields) in _NODE_SPECS.items()}
+
+
+# Resolution results for bindings that carry no type information.
+_RES_FUNC = ('func',)
+_RES_UNDEF = ('undef',)
+
+# The resolution walk covers expressions too, so it keeps the full
+# children layout; VarDecl and VarRef get dedicated handling in _resolve.
+_RESOLVE_FIELDS = {
+    _ast.Compound: (('statements', True),),
+    _ast.If: (('cond', False), ('then_branch', False), ('else_branch', False)),
+    _ast.While: (('cond', False), ('body', False)),
+    _ast.Return: (('expr', False),),
+    _ast.ExprStmt: (('expr', False),),
+    _ast.BinaryOp: (('left', False), ('right', False)),
+    _ast.UnaryOp: (('expr', False),),
+    _ast.FuncCall: (('args', True),),
+}
+
+_RSTEP = {cls: _make_step(None, fields) for cls, fields in _RESOLVE_FIELDS.items()}
+
+
+def _resolve(self, f, rscope, node):
+    # One pre-order pass that resolves every VarRef against the local
+    # scope, globals and functions exactly once, stashing the result on
+    # the node. Declarations are entered into rscope in visit order, so
+    # a reference before its declaration still comes out undeclared.
+    global_scope = self.global_scope
+    functions = self.functions
+    errors = self.errors
+    stack = [node]
+    pop = stack.pop
+    while stack:
+        n = pop()
+        if n is None:
+            continue
+        t = type(n)
+        if t is _ast.VarRef:
+            name = n.name
+            if name in rscope:
+                e = rscope[name]
+                n._res = ('local', e[0], e[1])
+            elif name in global_scope:
+                e = global_scope[name]
+                n._res = ('global', e[0], e[1])
+            elif name in functions:
+                n._res = _RES_FUNC
+                # function name used as value is not allowed
+                errors.append(f'Function {name} used as value in function {f.name}')
+            else:
+                n._res = _RES_UNDEF
+                errors.append(f'Use of undeclared identifier {name} in function {f.name}')
+            continue
+        if t is _ast.VarDecl:
+            rscope[n.name] = (n.var_type, n.is_const)
+            if n.init is not None:
+                stack.append(n.init)
+            continue
+        step = _RSTEP.get(t)
+        if step is not None:
+            step(self, f, rscope, n, stack)
+
+
+class SemanticAnalyzer:
+    def __init__(self, program: _ast.Program):
+        self.program = program
+        self.errors: List[str] = []
+        # map name -> (type, is_const)
+        self.global_scope: Dict[str, tuple] = {}
+        self.functions: Dict[str, _ast.FuncDecl] = {}
+
+    def analyze(self) -> None:
+        # collect globals and functions
+        for decl in self.program.declarations:
+            if isinstance(decl, _ast.VarDecl):
+                if decl.name in self.global_scope:
+                    self.errors.append(f'Redeclaration of global {decl.name}')
+                else:
+                    self.global_scope[decl.name] = (decl.var_type, decl.is_const)
+            elif isinstance(decl, _ast.FuncDecl):
+                if decl.name in self.functions:
+                    self.errors.append(f'Redeclaration of function {decl.name}')
+                else:
+                    self.functions[decl.name] = decl
+        # analyze functions
+        for fname, fdecl in self.functions.items():
+            self.check_function(fdecl)
+
+    def check_function(self, f: _ast.FuncDecl) -> None:
+        # simple local scope: map name -> (type, is_const)
+        scope = {name: (typ, False) for typ, name in f.params}
+        # resolve names first (on a copy, since the visit below re-enters
+        # declarations for its redeclaration checks), then run the checks
+        _resolve(self, f, dict(scope), f.body)
+        _visit(self, f, scope, f.body)